@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app_fast_api.routes.ssh_test import router as ssh_test_router
 from app_fast_api.routes.analyze_station_routes import router as analyze_station_router
 from app_fast_api.routes.feedback_routes import router as feedback_router
@@ -9,6 +10,39 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Respuestas estáticas de / y /health
+_HEALTH_RESPONSE = {"status": "healthy", "service": "Ubiquiti LLM Service"}
+_ROOT_RESPONSE = {"message": "Ubiquiti LLM Service API", "version": "1.0.0"}
+
+# Header X-Process-Time ya codificado (par crudo ASGI)
+_PROCESS_TIME_HEADER = (b"x-process-time", b"long-operation-enabled")
+
+
+class TimeoutHeaderMiddleware:
+    """
+    ASGI middleware that marks HTTP responses with X-Process-Time.
+
+    Works on the raw ASGI messages instead of BaseHTTPMiddleware, so responses
+    are not re-wrapped into a streaming response on every request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_header(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # No route sets this header, so append the raw pair instead of parsing headers
+                message["headers"] = [*message.get("headers", ()), _PROCESS_TIME_HEADER]
+            await send(message)
+
+        await self.app(scope, receive, send_with_header)
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title="Ubiquiti LLM Service",
@@ -18,12 +52,7 @@ def create_app() -> FastAPI:
     )
 
     # Configurar timeouts para operaciones largas
-    from fastapi import Request
-    @app.middleware("http")
-    async def add_timeout_header(request: Request, call_next):
-        response = await call_next(request)
-        response.headers["X-Process-Time"] = "long-operation-enabled"
-        return response
+    app.add_middleware(TimeoutHeaderMiddleware)
 
     app.add_middleware(
         CORSMiddleware,
@@ -100,14 +129,32 @@ def create_app() -> FastAPI:
 
         except Exception as e:
             logger.error(f"Error stopping polling service: {str(e)}")
+
+        # Cerrar cliente HTTP compartido de WhatsApp
+        try:
+            from app_fast_api.routes.alerting_routes import whatsapp_service
+
+            await whatsapp_service.close()
+
+        except Exception as e:
+            logger.error(f"Error closing WhatsApp client: {str(e)}")
+
+        # Cerrar clientes HTTP de UISP y OpenAI usados por el análisis de estaciones
+        try:
+            from app_fast_api.routes.analyze_station_routes import close_services
+
+            await close_services()
+
+        except Exception as e:
+            logger.error(f"Error closing station analysis clients: {str(e)}")
     
     @app.get("/health")
     async def health_check():
-        return {"status": "healthy", "service": "Ubiquiti LLM Service"}
+        return _HEALTH_RESPONSE
     
     @app.get("/")
     async def root():
-        return {"message": "Ubiquiti LLM Service API", "version": "1.0.0"}
+        return _ROOT_RESPONSE
     
     return app
     
\ No newline at end of file
@@ -5,7 +5,6 @@ load_dotenv()
 
 import uvicorn
 from app_fast_api import create_app
-from app_fast_api.utils.database import init_db, engine, Base
 import logging
 
 # Debug: Verificar si DATABASE_URL se cargó
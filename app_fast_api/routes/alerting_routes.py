@@ -6,13 +6,12 @@ import os
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional
-from datetime import datetime
 from enum import Enum
 
 from app_fast_api.services.alerting_services import UNMSAlertingService, AlertEventService
 from app_fast_api.services.whatsapp_service import WhatsAppService
 from app_fast_api.services.post_mortem_service import PostMortemService
-from app_fast_api.services.polling_service import initialize_polling_service, get_polling_service
+from app_fast_api.services.polling_service import initialize_polling_service
 from app_fast_api.repositories.alerting_repositories import (
     SiteMonitoringRepository,
     AlertEventRepository,
@@ -297,8 +296,8 @@ Horarios permitidos: 24h / 365 días"""
         }
 
         mock_event_data = {
-            "detected_at": now_argentina().strftime('%Y-%m-%d %H:%M:%S'),
-            "recovered_at": now_argentina().strftime('%H:%M:%S'),
+            "detected_at": format_argentina_datetime(now_argentina()),
+            "recovered_at": format_argentina_time(now_argentina()),
             "downtime_minutes": 155
         }
 
@@ -5,8 +5,9 @@ Routes para analizar estaciones y dispositivos Ubiquiti
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
+import asyncio
+import json
 import traceback
-from datetime import datetime
 from app_fast_api.services.uisp_services import UISPService
 from app_fast_api.services.llm_services import LLMService
 from app_fast_api.services.ubiquiti_ssh_client import UbiquitiSSHClient
@@ -27,6 +28,42 @@ _ssh_service = None
 _analyze_service = None
 _data_service = None
 
+# Encoder para previews de debug (compacto, tolera tipos no serializables)
+_PREVIEW_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def _json_preview(data: Any, limit: int = 2000) -> str:
+    """
+    Serializa data a JSON de forma incremental y corta apenas se alcanzan `limit` caracteres.
+
+    Args:
+        data: Objeto a serializar
+        limit: Cantidad máxima de caracteres del preview
+
+    Returns:
+        Primeros `limit` caracteres del JSON
+    """
+    chunks = []
+    size = 0
+    for chunk in _PREVIEW_ENCODER.iterencode(data):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return ''.join(chunks)[:limit]
+
+async def _discard_prefetch(prefetch: asyncio.Future) -> None:
+    """
+    Cancela un prefetch que ya no se va a usar y consume su resultado/excepción.
+
+    Args:
+        prefetch: Future de asyncio.gather lanzado antes del ping/escaneo
+    """
+    prefetch.cancel()
+    # return_exceptions consume el CancelledError/errores del prefetch; una cancelación
+    # del propio request mientras se espera se sigue propagando
+    await asyncio.gather(prefetch, return_exceptions=True)
+
 def get_services():
     """Obtiene instancias singleton de los servicios"""
     global _uisp_service, _llm_service, _ssh_service, _analyze_service, _data_service
@@ -59,6 +96,13 @@ def get_services():
     
     return _uisp_service, _llm_service, _ssh_service, _analyze_service, _data_service
 
+async def close_services() -> None:
+    """Cierra los clientes HTTP de los servicios singleton (si fueron creados)"""
+    if _uisp_service is not None:
+        await _uisp_service.close()
+    if _llm_service is not None:
+        await _llm_service.close()
+
 # Pydantic models
 class DeviceRequest(BaseModel):
     ip: str
@@ -92,7 +136,9 @@ async def analyze_station(device: DeviceRequest) -> Dict[str, Any]:
         
         # Paso 1: Identificar dispositivo
         logger.info("📡 Paso 1: Identificando dispositivo en UISP...")
-        device_data = await analyze_service.match_device_data(device.ip, device.mac)
+        # Un solo listado de UISP por análisis: lo reutilizan el match, el AP actual y el escaneo
+        uisp_devices = await uisp_service.get_all_uisp_devices()
+        device_data = await analyze_service.match_device_data(device.ip, device.mac, devices=uisp_devices)
         
         if not device_data:
             logger.warning(f"⚠️ Dispositivo {device.ip} no encontrado en UISP")
@@ -104,52 +150,70 @@ async def analyze_station(device: DeviceRequest) -> Dict[str, Any]:
         
         logger.info(f"✅ Dispositivo encontrado: {device_data.get('identification', {}).get('name', 'Unknown')}")
         
-        # Paso 2: Verificar conectividad con ping (10 segundos)
-        logger.info("🏓 Paso 2: Verificando conectividad con ping (10 segundos)...")
-        ping_result = await ssh_service.ping_device_seconds(device.ip, 10)
+        # Paso 3.5 (prefetch): estadísticas históricas y AP actual solo dependen de device_data,
+        # se piden ya para que corran mientras se hace ping y escaneo (pasos 2 y 3)
+        # TEMPORAL: Deshabilitado hasta resolver formato de UISP
+        statistics_analysis = None
+        enable_statistics = True  # Cambiar a True para habilitar
+
+        device_id = device_data.get('identification', {}).get('id') if enable_statistics else None
+        prefetch_coros = {'ap_complete_info': analyze_service.get_current_ap_data(device_data, devices=uisp_devices)}
+        if device_id:
+            prefetch_coros['statistics'] = uisp_service.get_device_statistics(device_id, interval='fourhours')
+
+        prefetch = asyncio.gather(*prefetch_coros.values())
+        scan_ok = False
+        try:
+            # Paso 2: Verificar conectividad con ping (10 segundos)
+            logger.info("🏓 Paso 2: Verificando conectividad con ping (10 segundos)...")
+            ping_result = await ssh_service.ping_device_seconds(device.ip, 10)
         
-        if not ping_result.get("status") == "success":
-            logger.warning(f"⚠️ Dispositivo {device.ip} no responde a ping")
-            return {
-                "status": "error",
-                "message": f"Dispositivo {device.ip} no responde a ping",
-                "device_info": device_data,
-                "ping_result": ping_result
-            }
+            if not ping_result.get("status") == "success":
+                logger.warning(f"⚠️ Dispositivo {device.ip} no responde a ping")
+                return {
+                    "status": "error",
+                    "message": f"Dispositivo {device.ip} no responde a ping",
+                    "device_info": device_data,
+                    "ping_result": ping_result
+                }
         
-        logger.info(f"✅ Ping exitoso: {ping_result.get('avg_ms', 'N/A')}ms de latencia")
+            logger.info(f"✅ Ping exitoso: {ping_result.get('avg_ms', 'N/A')}ms de latencia")
         
-        # Paso 3: Escanear y filtrar APs (usando función directa)
-        logger.info("📡 Paso 3: Escaneando y filtrando APs...")
-        scan_result = await analyze_service.scan_and_match_aps_direct(
-            device_data=device_data,
-            interface="ath0"
-        )
+            # Paso 3: Escanear y filtrar APs (usando función directa)
+            logger.info("📡 Paso 3: Escaneando y filtrando APs...")
+            scan_result = await analyze_service.scan_and_match_aps_direct(
+                device_data=device_data,
+                interface="ath0",
+                devices=uisp_devices
+            )
         
-        if not scan_result.get("status") == "success":
-            logger.warning(f"⚠️ Error en escaneo de APs: {scan_result.get('error', 'Unknown error')}")
-            return {
-                "status": "error",
-                "message": "Error escaneando APs",
-                "error": scan_result.get("error"),
-                "device_info": device_data,
-                "ping_result": ping_result
-            }
+            if not scan_result.get("status") == "success":
+                logger.warning(f"⚠️ Error en escaneo de APs: {scan_result.get('error', 'Unknown error')}")
+                return {
+                    "status": "error",
+                    "message": "Error escaneando APs",
+                    "error": scan_result.get("error"),
+                    "device_info": device_data,
+                    "ping_result": ping_result
+                }
         
-        logger.info(f"✅ Escaneo completado: {scan_result.get('our_aps_count', 0)} APs nuestros, {scan_result.get('foreign_aps_count', 0)} APs extranjeros")
+            logger.info(f"✅ Escaneo completado: {scan_result.get('our_aps_count', 0)} APs nuestros, {scan_result.get('foreign_aps_count', 0)} APs extranjeros")
 
-        # Paso 3.5: Obtener estadísticas históricas (series temporales)
-        # TEMPORAL: Deshabilitado hasta resolver formato de UISP
-        statistics_analysis = None
-        enable_statistics = True  # Cambiar a True para habilitar
+            scan_ok = True
+        finally:
+            if not scan_ok:
+                await _discard_prefetch(prefetch)
+
+        # Paso 3.5: Esperar estadísticas y AP actual (pedidos en paralelo con los pasos 2 y 3)
+        prefetched = dict(zip(prefetch_coros, await prefetch))
+        statistics = prefetched.get('statistics')
+        ap_complete_info = prefetched['ap_complete_info']
 
         if enable_statistics:
-            logger.info("📊 Paso 3.5: Obteniendo estadísticas históricas del dispositivo...")
-            device_id = device_data.get('identification', {}).get('id')
+            logger.info("📊 Paso 3.5: Procesando estadísticas históricas del dispositivo...")
 
             if device_id:
                 logger.info(f"🔍 Device ID: {device_id}")
-                statistics = await uisp_service.get_device_statistics(device_id, interval='fourhours')
 
                 if statistics:
                     logger.info(f"✅ Estadísticas obtenidas")
@@ -158,17 +222,19 @@ async def analyze_station(device: DeviceRequest) -> Dict[str, Any]:
                     logger.info(f"🔍 Keys de statistics: {statistics.keys() if isinstance(statistics, dict) else 'No es dict'}")
 
                     # Log complete structure for debugging
-                    import json
                     try:
                         logger.info(f"🔍 ESTRUCTURA COMPLETA DE STATISTICS:")
-                        logger.info(json.dumps(statistics, indent=2, default=str)[:2000])
+                        logger.info(_json_preview(statistics))
                     except Exception as e:
                         logger.warning(f"⚠️ No se pudo serializar statistics: {e}")
                         logger.info(f"🔍 Statistics raw: {str(statistics)[:1000]}")
 
                     # Analizar series temporales
                     try:
-                        statistics_analysis = StatisticsAnalyzerService.get_comprehensive_analysis(statistics)
+                        # Análisis CPU-bound sobre las series: en un thread para no frenar el event loop
+                        statistics_analysis = await asyncio.to_thread(
+                            StatisticsAnalyzerService.get_comprehensive_analysis, statistics
+                        )
                         logger.info(f"✅ Análisis de estadísticas completado")
                     except Exception as stats_error:
                         logger.error(f"⚠️ Error analizando estadísticas: {stats_error}")
@@ -181,13 +247,8 @@ async def analyze_station(device: DeviceRequest) -> Dict[str, Any]:
         # Paso 4: Analizar con LLM
         logger.info("🤖 Paso 4: Generando análisis con LLM...")
 
-        # Obtener información detallada del dispositivo
-        device_info_detail = await analyze_service.get_device_data(device_data)
-        analysis = device_info_detail
-
-        # Obtener información completa del AP actual (incluyendo clientes)
-        logger.info("📡 Obteniendo información completa del AP actual...")
-        ap_complete_info = await analyze_service.get_current_ap_data(device_data)
+        # Información detallada del dispositivo: el escaneo ya la calculó sobre el mismo device_data
+        analysis = scan_result.get('full_analysis') or await analyze_service.get_device_data(device_data)
 
         # Construir data completa para el prompt con la estructura correcta
         complete_data = {
@@ -512,7 +573,7 @@ async def get_device_statistics(device: DeviceRequest, interval: str = 'fourhour
 
         # Paso 3: Analizar series temporales
         logger.info("🔍 Analizando series temporales...")
-        analysis = StatisticsAnalyzerService.get_comprehensive_analysis(statistics)
+        analysis = await asyncio.to_thread(StatisticsAnalyzerService.get_comprehensive_analysis, statistics)
 
         return {
             "status": "success",
@@ -4,7 +4,7 @@ Rutas para ver logs de la aplicación
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Optional
 from datetime import datetime
 import logging
 
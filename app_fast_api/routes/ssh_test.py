@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
+import asyncio
 import logging
 
 from app_fast_api.services.ubiquiti_ssh_client import UbiquitiSSHClient
@@ -12,6 +13,29 @@ router = APIRouter(prefix="/ssh-test", tags=["SSH Test"])
 # Instancia del cliente SSH
 ssh_client = UbiquitiSSHClient()
 
+# Respuesta estática de /test-endpoints (se arma una sola vez)
+_TEST_ENDPOINTS_RESPONSE = {
+    "message": "SSH Test API funcionando",
+    "available_endpoints": [
+        "POST /ssh-test/connect - Prueba conexión SSH",
+        "POST /ssh-test/command - Ejecuta comando",
+        "POST /ssh-test/scan-aps - Escanea APs cercanos",
+        "POST /ssh-test/device-info - Obtiene info del dispositivo",
+        "POST /ssh-test/enable-ac-freq - Habilita frecuencias AC",
+        "POST /ssh-test/enable-m5-freq - Habilita frecuencias M5/AC",
+        "GET /ssh-test/test-endpoints - Este endpoint"
+    ]
+}
+
+# Comandos de /device-info (nombre -> comando)
+_DEVICE_INFO_COMMANDS = {
+    "system_info": "uname -a",
+    "uptime": "uptime",
+    "memory": "free -m",
+    "disk": "df -h",
+    "interfaces": "ip link show"
+}
+
 class SSHConnectionRequest(BaseModel):
     host: str
     username: Optional[str] = None
@@ -126,37 +150,32 @@ async def get_device_info(request: SSHConnectionRequest) -> Dict[str, Any]:
     Obtiene información básica del dispositivo
     """
     try:
-        commands = {
-            "system_info": "uname -a",
-            "uptime": "uptime",
-            "memory": "free -m",
-            "disk": "df -h",
-            "interfaces": "ip link show"
-        }
-        
-        results = {}
         conn = await ssh_client.connect(
             host=request.host,
             username=request.username,
             password=request.password,
             port=request.port
         )
-        
-        for name, cmd in commands.items():
+
+        async def run_command(cmd: str) -> Dict[str, Any]:
             try:
                 result = await conn.run(cmd, check=True)
-                results[name] = {
+                return {
                     "success": True,
                     "output": result.stdout.strip()
                 }
             except Exception as e:
-                results[name] = {
+                return {
                     "success": False,
                     "error": str(e)
                 }
-        
-        conn.close()
-        await conn.wait_closed()
+
+        # Los comandos son independientes: un canal por comando sobre la misma conexión SSH.
+        # La conexión se cierra al salir del bloque aunque algún comando falle
+        async with conn:
+            async with asyncio.TaskGroup() as tg:
+                tasks = {name: tg.create_task(run_command(cmd)) for name, cmd in _DEVICE_INFO_COMMANDS.items()}
+        results = {name: task.result() for name, task in tasks.items()}
         
         return {
             "success": True,
@@ -245,15 +264,4 @@ async def test_endpoints():
     """
     Endpoint de prueba para verificar que las rutas funcionan
     """
-    return {
-        "message": "SSH Test API funcionando",
-        "available_endpoints": [
-            "POST /ssh-test/connect - Prueba conexión SSH",
-            "POST /ssh-test/command - Ejecuta comando",
-            "POST /ssh-test/scan-aps - Escanea APs cercanos",
-            "POST /ssh-test/device-info - Obtiene info del dispositivo",
-            "POST /ssh-test/enable-ac-freq - Habilita frecuencias AC",
-            "POST /ssh-test/enable-m5-freq - Habilita frecuencias M5/AC",
-            "GET /ssh-test/test-endpoints - Este endpoint"
-        ]
-    }
+    return _TEST_ENDPOINTS_RESPONSE
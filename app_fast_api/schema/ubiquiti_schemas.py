@@ -1,7 +1,6 @@
 """Schemas for Ubiquiti monitoring models."""
 
-from marshmallow import Schema, fields, validate
-from datetime import datetime
+from marshmallow import Schema, fields
 
 
 class DeviceAnalysisSchema(Schema):
@@ -1,8 +1,9 @@
 """Alerting Services for site monitoring and event management."""
 
+import asyncio
 import httpx
-import json
-from typing import Dict, Any, Optional, List
+import time
+from typing import Awaitable, Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
 from app_fast_api.models.ubiquiti_monitoring.alerting import (
@@ -12,11 +13,22 @@ from app_fast_api.models.ubiquiti_monitoring.post_mortem import PostMortemStatus
 from app_fast_api.repositories.alerting_repositories import (
     SiteMonitoringRepository, AlertEventRepository, PostMortemRepository
 )
+from app_fast_api.utils.json_utils import decode_json_response, encode_json
 from app_fast_api.utils.logger import get_logger
 from app_fast_api.utils.timezone import format_argentina_datetime, now_argentina
 
 logger = get_logger(__name__)
 
+# Endpoint de sites de UNMS (relativo a base_url)
+_SITES_PATH = '/nms/api/v2.1/sites'
+
+# TTL (segundos) del resultado de check_uisp_availability
+UISP_AVAILABILITY_TTL = 2.0
+
+# Máximo de alertas de WhatsApp enviándose a la vez durante un scan. Cada alerta hace hasta
+# 2 POST, así que 5 alertas ocupan como mucho 10 de las 20 conexiones del cliente de WhatsApp
+WHATSAPP_MAX_CONCURRENT_ALERTS = 5
+
 
 class UNMSAlertingService:
     """Service for monitoring UNMS sites and managing alerts."""
@@ -52,15 +64,20 @@ class UNMSAlertingService:
                 'Accept': 'application/json'
             },
             timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
             verify=False
         )
 
+        # Último resultado del probe de disponibilidad: (monotonic, disponible).
+        # -inf = nunca se midió, así la primera llamada siempre hace el probe
+        self._availability_cache = (float('-inf'), False)
+
     async def get_all_sites(self) -> Optional[List[Dict[str, Any]]]:
         """Get all sites from UNMS API."""
         try:
-            response = await self.session.get('/nms/api/v2.1/sites')
+            response = await self.session.get(_SITES_PATH)
             response.raise_for_status()
-            sites = response.json()
+            sites = decode_json_response(response)
             logger.info(f"Retrieved {len(sites)} sites from UNMS")
             return sites
         except httpx.RequestError as e:
@@ -192,7 +209,7 @@ class UNMSAlertingService:
                 'outage_percentage': outage_percentage,
                 'is_site_down': is_down,
                 'note': description.get('note'),
-                'ip_addresses': json.dumps(description.get('ipAddresses', [])),
+                'ip_addresses': encode_json(description.get('ipAddresses', [])),
                 'regulatory_domain': description.get('regulatoryDomain'),
                 'suspended': identification.get('suspended', False),
                 'last_checked': now_argentina(),
@@ -232,9 +249,23 @@ class UNMSAlertingService:
         Returns:
             AlertEvent if created, None otherwise
         """
+        event, _ = await self.check_site_events(site, self.event_repo.get_events_by_site(site.id))
+        return event
+
+    async def check_site_events(self, site: SiteMonitoring,
+                                existing_events: List[AlertEvent]) -> Tuple[Optional[AlertEvent], List[AlertEvent]]:
+        """
+        Create or auto-resolve the outage events of a site from its already loaded events.
+
+        Args:
+            site: SiteMonitoring object
+            existing_events: Site events loaded by the caller (not modified)
+
+        Returns:
+            (AlertEvent if created else None, site events with auto-resolved ones refreshed)
+        """
         try:
             # Check if there's already an active event for this site
-            existing_events = self.event_repo.get_events_by_site(site.id)
             active_outage_events = [
                 e for e in existing_events
                 if e.status == AlertStatus.ACTIVE and e.event_type in [EventType.SITE_OUTAGE, EventType.SITE_DEGRADED]
@@ -263,7 +294,7 @@ class UNMSAlertingService:
                     # Auto-create Post-Mortem for critical site outages
                     self.create_post_mortem_for_event(event, site)
 
-                    return event
+                    return event, existing_events
 
             elif site.outage_percentage >= 50.0:
                 # Site is degraded (50-95%)
@@ -283,12 +314,13 @@ class UNMSAlertingService:
                     }
                     event = self.event_repo.create_event(event_data)
                     logger.warning(f"HIGH ALERT: {event.title}")
-                    return event
+                    return event, existing_events
             else:
                 # Site is healthy - auto-resolve any active events
                 if active_outage_events:
+                    resolved_events = {}
                     for event in active_outage_events:
-                        self.event_repo.resolve_event(
+                        resolved_events[event.id] = self.event_repo.resolve_event(
                             event.id,
                             resolved_by='system',
                             note=f'Sitio recuperado. Dispositivos activos: {site.device_count - site.device_outage_count}/{site.device_count}',
@@ -296,7 +328,9 @@ class UNMSAlertingService:
                         )
                         logger.info(f"Auto-resolved event {event.id} for site {site.site_name}")
 
-            return None
+                    return None, [resolved_events.get(e.id) or e for e in existing_events]
+
+            return None, existing_events
 
         except Exception as e:
             logger.error(f"Error checking/creating outage event: {str(e)}")
@@ -363,12 +397,26 @@ class UNMSAlertingService:
         """
         Check if UISP API is available and responding.
 
+        The result is reused for UISP_AVAILABILITY_TTL seconds so bursts of
+        scans don't probe UISP on every call.
+
         Returns:
             True if UISP is available, False otherwise
         """
+        checked_at, available = self._availability_cache
+        if time.monotonic() - checked_at < UISP_AVAILABILITY_TTL:
+            return available
+
+        available = await self._probe_uisp()
+        self._availability_cache = (time.monotonic(), available)
+        return available
+
+    async def _probe_uisp(self) -> bool:
+        """Probe UISP once, without caching."""
         try:
-            response = await self.session.get('/nms/api/v2.1/sites', timeout=5.0)
-            response.raise_for_status()
+            # Solo se valida el status; el body (todos los sites) no se descarga ni se parsea
+            async with self.session.stream('GET', _SITES_PATH, timeout=5.0) as response:
+                response.raise_for_status()
             logger.info("✅ UISP API is available")
             return True
         except httpx.TimeoutException:
@@ -381,6 +429,41 @@ class UNMSAlertingService:
             logger.error(f"❌ UISP API unavailable: {e}")
             return False
 
+    async def _dispatch_alert(self, kind: str, site_name: str, event_id: Optional[int],
+                              send: Awaitable[Dict[str, Any]],
+                              semaphore: asyncio.Semaphore) -> Tuple[str, str, Optional[int], Optional[Dict[str, Any]]]:
+        """
+        Await one WhatsApp alert send, tagging its result so it can be tallied out of order.
+
+        A recovery event is marked notified as soon as its send returns, so an overlapping
+        scan does not pick it up again while the other sends are still running.
+
+        Args:
+            kind: 'outage' or 'recovery'
+            site_name: Site name, for logging
+            event_id: Resolved event to mark as notified (recovery only)
+            send: Pending send_outage_alert / send_recovery_alert coroutine
+            semaphore: Caps how many alerts are being sent at once
+
+        Returns:
+            (kind, site_name, event_id, results); results is None if the send raised
+        """
+        try:
+            async with semaphore:
+                results = await send
+        except Exception as e:
+            logger.error(f"Error processing site {site_name}: {str(e)}")
+            return kind, site_name, event_id, None
+
+        if kind == 'recovery':
+            try:
+                # Mark as notified (even if notification failed, to avoid infinite retries)
+                self.event_repo.mark_recovery_notified(event_id)
+            except Exception as e:
+                logger.error(f"Error marking recovery notified for site {site_name}: {str(e)}")
+
+        return kind, site_name, event_id, results
+
     async def scan_and_alert_sites_with_whatsapp(self, whatsapp_service) -> Dict[str, Any]:
         """
         Scan all sites and send WhatsApp alerts for outages/recoveries.
@@ -423,13 +506,21 @@ class UNMSAlertingService:
             notifications_sent = 0
             notification_failures = 0
 
+            # WhatsApp sends are queued as tasks; they run concurrently once the site
+            # loop ends and are tallied with as_completed as they finish
+            alert_tasks = []
+            send_semaphore = asyncio.Semaphore(WHATSAPP_MAX_CONCURRENT_ALERTS)
+
             for site_data in sites_data:
                 try:
                     # Process site and save to DB
                     site = await self.process_site_data(site_data)
 
-                    # Check if we need to create/resolve events
-                    event = await self.check_and_create_outage_event(site)
+                    # Site events are loaded once and shared by the outage and recovery checks
+                    site_events = self.event_repo.get_events_by_site(site.id)
+
+                    # Check if we need to create/resolve events; auto-resolved events come back refreshed
+                    event, site_events = await self.check_site_events(site, site_events)
 
                     # If new outage event created, send WhatsApp alerts
                     if event and event.status == AlertStatus.ACTIVE:
@@ -442,27 +533,18 @@ class UNMSAlertingService:
                             }
 
                             # Send WhatsApp notifications
-                            results = await whatsapp_service.send_outage_alert(site_data, event_data)
-
-                            # Track notification results
-                            if results.get('complete', {}).get('success'):
-                                notifications_sent += 1
-                            else:
-                                notification_failures += 1
-
-                            if results.get('summary', {}).get('success'):
-                                notifications_sent += 1
-                            else:
-                                notification_failures += 1
-
-                            sites_down += 1
+                            alert_tasks.append(asyncio.create_task(self._dispatch_alert(
+                                'outage', site.site_name, None,
+                                whatsapp_service.send_outage_alert(site_data, event_data),
+                                send_semaphore
+                            )))
 
                     # Check for recoveries - use flag instead of time window
                     if not site.is_site_down and site.outage_percentage < 50.0:
                         # Get resolved events that haven't been notified yet
                         # ONLY send recovery for CRITICAL (SITE_OUTAGE), not WARNING (SITE_DEGRADED)
                         pending_notifications = [
-                            e for e in self.event_repo.get_events_by_site(site.id)
+                            e for e in site_events
                             if e.status == AlertStatus.RESOLVED
                             and e.auto_resolved
                             and not e.recovery_notified
@@ -483,22 +565,49 @@ class UNMSAlertingService:
                             }
 
                             # Send recovery notifications
-                            recovery_results = await whatsapp_service.send_recovery_alert(site_data, recovery_event_data)
+                            alert_tasks.append(asyncio.create_task(self._dispatch_alert(
+                                'recovery', site.site_name, resolved_event.id,
+                                whatsapp_service.send_recovery_alert(site_data, recovery_event_data),
+                                send_semaphore
+                            )))
 
-                            # Track notification results
-                            if recovery_results.get('complete', {}).get('success'):
-                                notifications_sent += 1
+                except Exception as e:
+                    logger.error(f"Error processing site {site_data.get('identification', {}).get('name', 'unknown')}: {str(e)}")
+                    continue
 
-                            if recovery_results.get('summary', {}).get('success'):
-                                notifications_sent += 1
+            # Track notification results as each send finishes
+            if alert_tasks:
+                logger.info(f"📤 Waiting for {len(alert_tasks)} WhatsApp alert sends")
+            for done, next_done in enumerate(asyncio.as_completed(alert_tasks), start=1):
+                kind, site_name, event_id, results = await next_done
+                logger.info(f"📤 WhatsApp {kind} alert finished ({done}/{len(alert_tasks)})")
+                if results is None:
+                    continue
 
-                            # Mark as notified (even if notification failed, to avoid infinite retries)
-                            self.event_repo.mark_recovery_notified(resolved_event.id)
+                try:
+                    if kind == 'outage':
+                        if results.get('complete', {}).get('success'):
+                            notifications_sent += 1
+                        else:
+                            notification_failures += 1
 
-                            sites_recovered += 1
+                        if results.get('summary', {}).get('success'):
+                            notifications_sent += 1
+                        else:
+                            notification_failures += 1
+
+                        sites_down += 1
+                    else:
+                        if results.get('complete', {}).get('success'):
+                            notifications_sent += 1
+
+                        if results.get('summary', {}).get('success'):
+                            notifications_sent += 1
+
+                        sites_recovered += 1
 
                 except Exception as e:
-                    logger.error(f"Error processing site {site_data.get('identification', {}).get('name', 'unknown')}: {str(e)}")
+                    logger.error(f"Error processing site {site_name}: {str(e)}")
                     continue
 
             summary = {
@@ -1,4 +1,3 @@
-import re
 from app_fast_api.services.llm_services import LLMService
 from app_fast_api.services.uisp_services import UISPService
 from app_fast_api.services.ubiquiti_ssh_client import UbiquitiSSHClient
@@ -20,15 +19,22 @@ class AnalyzeStationsServices:
         """Helper to safely convert None to a default value for math operations."""
         return val if val is not None else default
 
-    async def match_device_data(self, ip: str = None, mac: str = None) -> dict:
-        """ Identifica el dispositivo por IP o MAC """
+    async def match_device_data(self, ip: str = None, mac: str = None, devices: list = None) -> dict:
+        """
+        Identifica el dispositivo por IP o MAC
+
+        Args:
+            ip: IP del dispositivo
+            mac: MAC del dispositivo
+            devices: Listado de UISP ya obtenido en este análisis; se consulta a UISP si se omite
+        """
 
         if not ip and not mac:
             return None
 
         logger.info(f"Buscando dispositivo: IP={ip}, MAC={mac}")
         
-        all_data = await self.uisp_service.get_all_uisp_devices()
+        all_data = devices if devices is not None else await self.uisp_service.get_all_uisp_devices()
         
         if not all_data:
             logger.error("No se obtuvieron dispositivos de UISP")
@@ -167,18 +173,24 @@ class AnalyzeStationsServices:
         }
         return processed_data
 
+    # Modelo -> método de UbiquitiSSHClient que habilita sus frecuencias
+    _FREQUENCY_HANDLERS = {
+        "ac": "enable_all_AC_frequencies",
+        "m5": "enable_all_m5_frequencies",
+        "m2": None,
+    }
+
     async def enabled_frecuency(self, model: str, ip: str):
         """"""
         try:
-            if model == "ac":
-                await self.ssh_service.enable_all_AC_frequencies(ip,model)
-            elif model == "m5":
-                await self.ssh_service.enable_all_m5_frequencies(ip,model)
-            elif model == "m2":
-                pass
-            else:
+            if model not in self._FREQUENCY_HANDLERS:
                 raise ValueError(f"Modelo no soportado: {model}")
 
+            # m2 no requiere habilitar frecuencias
+            handler_name = self._FREQUENCY_HANDLERS[model]
+            if handler_name is not None:
+                await getattr(self.ssh_service, handler_name)(ip, model)
+
             return {"status": "success", "model": model, "ip": ip}
 
         except Exception as e:
@@ -278,12 +290,13 @@ class AnalyzeStationsServices:
             "matched_aps": matched_aps  # Para compatibilidad
         }
 
-    async def get_current_ap_data(self, device_data: dict) -> dict:
+    async def get_current_ap_data(self, device_data: dict, devices: list = None) -> dict:
         """
         Obtiene los datos completos del AP actual al que está conectado el dispositivo
 
         Args:
             device_data: Datos del dispositivo desde UISP
+            devices: Listado de UISP ya obtenido en este análisis; se consulta a UISP si se omite
 
         Returns:
             Dict con información completa del AP actual
@@ -308,7 +321,7 @@ class AnalyzeStationsServices:
             logger.info(f"Buscando AP actual: {ap_name} ({ap_model})")
 
             # Obtener todos los dispositivos UISP para encontrar el AP completo
-            all_uisp_devices = await self.uisp_service.get_all_uisp_devices()
+            all_uisp_devices = devices if devices is not None else await self.uisp_service.get_all_uisp_devices()
 
             # Buscar el AP por ID
             ap_complete_data = None
@@ -375,7 +388,7 @@ class AnalyzeStationsServices:
                 "error": str(e)
             }
 
-    async def scan_and_match_aps_direct(self, device_data: dict, interface: str = "ath0") -> dict:
+    async def scan_and_match_aps_direct(self, device_data: dict, interface: str = "ath0", devices: list = None) -> dict:
         """
         Escanea APs y hace match usando device_data ya obtenido (evita doble consulta a UISP)
         Identifica APs propios por BSSID de UISP y separa los que no son nuestros
@@ -383,6 +396,7 @@ class AnalyzeStationsServices:
         Args:
             device_data: Datos del dispositivo ya obtenidos de UISP
             interface: Interfaz wireless (default: ath0)
+            devices: Listado de UISP ya obtenido en este análisis; se consulta a UISP si se omite
 
         Returns:
             Diccionario con resultados del escaneo y matching
@@ -441,12 +455,12 @@ class AnalyzeStationsServices:
                 }
 
             # Extraer BSSIDs del escaneo para buscar solo esos en UISP
-            scanned_bssids = [ap.get("bssid", "").lower() for ap in scanned_aps]
+            scanned_bssids = {ap.get("bssid", "").lower() for ap in scanned_aps}
             logger.info(f"BSSIDs escaneados a buscar en UISP: {scanned_bssids}")
 
             # Obtener todos los dispositivos UISP pero filtrar por BSSIDs escaneados
             logger.info("Obteniendo dispositivos UISP para BSSIDs escaneados...")
-            all_uisp_devices = await self.uisp_service.get_all_uisp_devices()
+            all_uisp_devices = devices if devices is not None else await self.uisp_service.get_all_uisp_devices()
 
             uisp_aps_by_bssid = {}
 
@@ -454,18 +468,20 @@ class AnalyzeStationsServices:
             logger.info("Identificando APs UISP que coinciden con escaneo...")
             ap_count = 0
             for device in all_uisp_devices:
-                if device.get("identification", {}).get("role") == "ap":
-                    mac = device.get("identification", {}).get("mac", "").lower()
+                identification = device.get("identification", {})
+                if identification.get("role") == "ap":
+                    mac = identification.get("mac", "").lower()
                     if mac and mac in scanned_bssids:
                         ap_count += 1
+                        overview = device.get("overview", {})
                         uisp_aps_by_bssid[mac] = {
-                            "name": device.get("identification", {}).get("name", "N/A"),
-                            "model": device.get("identification", {}).get("model", "N/A"),
+                            "name": identification.get("name", "N/A"),
+                            "model": identification.get("model", "N/A"),
                             "ip": device.get("ipAddress", "N/A"),
-                            "site": device.get("identification", {}).get("site", {}).get("name", "N/A"),
-                            "stations_count": device.get("overview", {}).get("stationsCount", 0),
-                            "signal": device.get("overview", {}).get("signal", "N/A"),
-                            "frequency": device.get("overview", {}).get("frequency", "N/A")
+                            "site": identification.get("site", {}).get("name", "N/A"),
+                            "stations_count": overview.get("stationsCount", 0),
+                            "signal": overview.get("signal", "N/A"),
+                            "frequency": overview.get("frequency", "N/A")
                         }
                         logger.info(f"AP propio encontrado en escaneo: {uisp_aps_by_bssid[mac]['name']} ({mac})")
 
@@ -2,19 +2,39 @@
     Servicio LLM simplificado.
 """
 
+import asyncio
 import logging
 import os
-from openai import AsyncOpenAI
+
+import httpx
 
 
 logger = logging.getLogger(__name__)
 
+# Pool propio para OpenAI: las llamadas llegan espaciadas (una por /analyze), así que se
+# mantiene la conexión viva 60s en lugar de los 5s por defecto de httpx y se evita
+# repetir el handshake TLS en cada análisis
+_OPENAI_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0)
+
+# Mensaje de sistema fijo: va primero y siempre idéntico para que OpenAI pueda reutilizar el prefijo
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "Eres técnico de NOC. Resumen MUY BREVE (2-3 párrafos). Enfócate en problemas detectados y da recomendación clara y directa."
+}
+
 class LLMService:
     """
     Servicio LLM simplificado.
     Esta clase solo mantiene la configuración básica del cliente.
     """
     def __init__(self, api_key: str = None, model: str = "gpt-4o-mini"):
+        """
+        Inicializa el cliente de OpenAI
+
+        Args:
+            api_key: API Key de OpenAI (default: variable OPENAI_API_KEY)
+            model: Modelo a usar
+        """
         # Si no se proporciona API Key, obtener de variable de entorno
         if not api_key:
             api_key = os.getenv("OPENAI_API_KEY")
@@ -28,13 +48,27 @@ class LLMService:
         
         self.api_key = api_key
         self.model = model
-        self.client = AsyncOpenAI(api_key=api_key)
+
+        # Límite de llamadas simultáneas a OpenAI; los 429 los reintenta el SDK con backoff
+        self._semaphore = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "4")))
+        max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
+
+        # Import diferido: el SDK de OpenAI es pesado y solo se necesita al crear el servicio
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(limits=_OPENAI_LIMITS),
+            max_retries=max_retries
+        )
         
         # Enmascarar API Key para logs
         masked_key = api_key[:8] + "..." + api_key[-8:] if len(api_key) > 16 else "***"
         logger.info(f"🤖 LLM Service inicializado con API Key: {masked_key}")
 
 
+    async def close(self) -> None:
+        """Cierra el cliente de OpenAI y su pool de conexiones"""
+        await self.client.close()
 
     async def analyze(self, data: dict) -> str:
         """
@@ -42,17 +76,16 @@ class LLMService:
         """
 
         try:
-            client = AsyncOpenAI(api_key=self.api_key)
-
-            response = await client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system",
-                     "content": "Eres técnico de NOC. Resumen MUY BREVE (2-3 párrafos). Enfócate en problemas detectados y da recomendación clara y directa."},
-                    {"role": "user", "content": data.get("prompt")}
-                ],
-                max_completion_tokens=500
-            )
+            # Reusar el cliente (y su pool de conexiones) creado en __init__
+            async with self._semaphore:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        _SYSTEM_MESSAGE,
+                        {"role": "user", "content": data.get("prompt")}
+                    ],
+                    max_completion_tokens=500
+                )
 
             if response.choices and len(response.choices) > 0:
                 summary = response.choices[0].message.content.strip()
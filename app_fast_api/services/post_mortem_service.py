@@ -3,16 +3,29 @@ Post-Mortem Service for incident analysis and documentation.
 """
 
 from typing import Dict, Any, List, Optional
-from datetime import datetime
-import json
 
 from app_fast_api.repositories.alerting_repositories import PostMortemRepository, AlertEventRepository
 from app_fast_api.models.ubiquiti_monitoring.post_mortem import PostMortemStatus
+from app_fast_api.utils.json_utils import encode_json
 from app_fast_api.utils.logger import get_logger
 from app_fast_api.utils.timezone import to_argentina_isoformat, now_argentina
 
 logger = get_logger(__name__)
 
+# Campos actualizables de un post-mortem
+_SIMPLE_FIELDS = (
+    'title', 'summary', 'root_cause', 'trigger', 'impact_description',
+    'affected_users', 'affected_devices', 'severity', 'customer_impact',
+    'resolution_description', 'lessons_learned', 'author',
+    'incident_start', 'incident_end'
+)
+
+_JSON_FIELDS = (
+    'timeline_events', 'response_actions', 'preventive_actions',
+    'action_items', 'reviewers', 'contributors', 'tags',
+    'related_incidents', 'external_links'
+)
+
 
 class PostMortemService:
     """Service for managing post-mortem incident analysis."""
@@ -74,18 +87,18 @@ class PostMortemService:
             'affected_devices': data.get('affected_devices'),
             'severity': data.get('severity', default_severity),
             'customer_impact': data.get('customer_impact'),
-            'timeline_events': json.dumps(data.get('timeline_events', [])),
-            'response_actions': json.dumps(data.get('response_actions', [])),
+            'timeline_events': encode_json(data.get('timeline_events', [])),
+            'response_actions': encode_json(data.get('response_actions', [])),
             'resolution_description': data.get('resolution_description'),
-            'preventive_actions': json.dumps(data.get('preventive_actions', [])),
+            'preventive_actions': encode_json(data.get('preventive_actions', [])),
             'lessons_learned': data.get('lessons_learned'),
-            'action_items': json.dumps(data.get('action_items', [])),
+            'action_items': encode_json(data.get('action_items', [])),
             'author': data.get('author'),
-            'reviewers': json.dumps(data.get('reviewers', [])),
-            'contributors': json.dumps(data.get('contributors', [])),
-            'tags': json.dumps(data.get('tags', [])),
-            'related_incidents': json.dumps(data.get('related_incidents', [])),
-            'external_links': json.dumps(data.get('external_links', [])),
+            'reviewers': encode_json(data.get('reviewers', [])),
+            'contributors': encode_json(data.get('contributors', [])),
+            'tags': encode_json(data.get('tags', [])),
+            'related_incidents': encode_json(data.get('related_incidents', [])),
+            'external_links': encode_json(data.get('external_links', [])),
             'created_at': now_argentina(),
             'updated_at': now_argentina()
         }
@@ -162,31 +175,9 @@ class PostMortemService:
         if not post_mortem:
             raise ValueError(f"Post-mortem {pm_id} not found")
 
-        # Prepare update data
-        update_data = {}
-
-        # Simple fields
-        simple_fields = [
-            'title', 'summary', 'root_cause', 'trigger', 'impact_description',
-            'affected_users', 'affected_devices', 'severity', 'customer_impact',
-            'resolution_description', 'lessons_learned', 'author',
-            'incident_start', 'incident_end'
-        ]
-
-        for field in simple_fields:
-            if field in data:
-                update_data[field] = data[field]
-
-        # JSON fields
-        json_fields = [
-            'timeline_events', 'response_actions', 'preventive_actions',
-            'action_items', 'reviewers', 'contributors', 'tags',
-            'related_incidents', 'external_links'
-        ]
-
-        for field in json_fields:
-            if field in data:
-                update_data[field] = json.dumps(data[field])
+        # Prepare update data: simple fields as-is, JSON fields serialized
+        update_data = {field: data[field] for field in _SIMPLE_FIELDS if field in data}
+        update_data.update({field: encode_json(data[field]) for field in _JSON_FIELDS if field in data})
 
         # Recalculate downtime if dates changed
         if 'incident_start' in data or 'incident_end' in data:
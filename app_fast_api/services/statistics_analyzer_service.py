@@ -2,13 +2,15 @@
 Service for analyzing UISP device statistics timeseries data
 """
 
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any
 from app_fast_api.utils.logger import get_logger
 from app_fast_api.utils.timezone import now_argentina
 
 logger = get_logger(__name__)
 
+# Cantidad de eventos de caída de señal que se incluyen en el análisis
+MAX_REPORTED_DROPS = 5
+
 
 class StatisticsAnalyzerService:
     """Analyzes UISP statistics timeseries to detect outages, degradation, and patterns."""
@@ -158,15 +160,19 @@ class StatisticsAnalyzerService:
         max_signal = max(signal_values)
         avg_signal = sum(signal_values) / len(signal_values)
 
-        # Detect signal drops (>10 dBm drop from average)
+        # Detect signal drops (>10 dBm drop from average); only the reported ones are materialized
+        drop_threshold = avg_signal - 10
         drops = []
+        drops_detected = 0
         for i, signal in enumerate(signal_values):
-            if signal < (avg_signal - 10):
-                drops.append({
-                    "timestamp": timestamps[i] if i < len(timestamps) else None,
-                    "signal_dbm": signal,
-                    "drop_magnitude": avg_signal - signal
-                })
+            if signal < drop_threshold:
+                drops_detected += 1
+                if len(drops) < MAX_REPORTED_DROPS:
+                    drops.append({
+                        "timestamp": timestamps[i] if i < len(timestamps) else None,
+                        "signal_dbm": signal,
+                        "drop_magnitude": avg_signal - signal
+                    })
 
         return {
             "current_signal_dbm": round(current_signal, 2) if current_signal else None,
@@ -174,8 +180,8 @@ class StatisticsAnalyzerService:
             "max_signal_dbm": round(max_signal, 2),
             "avg_signal_dbm": round(avg_signal, 2),
             "signal_stability": "stable" if (max_signal - min_signal) < 10 else "unstable",
-            "drops_detected": len(drops),
-            "drop_events": drops[:5],  # Last 5 drops
+            "drops_detected": drops_detected,
+            "drop_events": drops,  # Last 5 drops
             "data_points": len(signal_values)
         }
 
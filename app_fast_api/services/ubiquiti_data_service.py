@@ -1,12 +1,11 @@
 """Service for managing Ubiquiti monitoring data persistence."""
 
-from datetime import datetime
 from app_fast_api.utils.timezone import now_argentina
 from typing import List, Optional, Dict, Any
 
 from app_fast_api.repositories.ubiquiti_repositories import DeviceAnalysisRepository, ScanResultRepository, FrequencyChangeRepository
-from app_fast_api.models.ubiquiti_monitoring.device_analysis import DeviceAnalysis, ScanResult, FrequencyChange
-import json
+from app_fast_api.models.ubiquiti_monitoring.device_analysis import DeviceAnalysis, FrequencyChange
+from app_fast_api.utils.json_utils import encode_json
 
 
 class UbiquitiDataService:
@@ -64,12 +63,12 @@ class UbiquitiDataService:
             'our_aps_count': scan_results.get('our_aps_count') or 0,
             'foreign_aps_count': scan_results.get('foreign_aps_count') or 0,
             'llm_summary': llm_analysis.get('summary'),
-            'llm_recommendations': json.dumps(llm_analysis.get('recommendations', [])),
+            'llm_recommendations': encode_json(llm_analysis.get('recommendations', [])),
             'llm_diagnosis': llm_analysis.get('diagnosis') or 'No diagnosis provided',
             'analysis_date': now_argentina(),
             'needs_frequency_enable': llm_analysis.get('needs_frequency_enable', False),
             'next_action': llm_analysis.get('next_action') or 'no_action',
-            'complete_data_json': json.dumps(complete_data)
+            'complete_data_json': encode_json(complete_data)
         }
         
         # Create analysis
@@ -2,8 +2,8 @@ import logging
 from typing import Dict, Any, List, Optional
 import asyncssh
 import asyncio
+import re
 import time
-import subprocess
 import platform
 from ping3 import ping
 
@@ -11,6 +11,17 @@ from app_fast_api.utils.constans import ac_m5_device_frencuency
 from app_fast_api.services.ssh_auth_service import ssh_auth_service
 logger = logging.getLogger(__name__)
 
+# Porcentaje de pérdida en el resumen del ping ("10.0% packet loss")
+_PACKET_LOSS_RE = re.compile(r'(\d+\.?\d*)%')
+
+# Señal asumida para APs sin "Signal level" al ordenar el escaneo
+_NO_SIGNAL_DBM = -100
+
+
+def _signal_sort_key(ap: Dict[str, Any]) -> int:
+    """Clave de orden del escaneo: señal en dBm (más fuerte = mayor)"""
+    return ap.get("signal_dbm", _NO_SIGNAL_DBM)
+
 
 class UbiquitiSSHClient:
     """Cliente SSH para conectarse directamente a dispositivos Ubiquiti"""
@@ -276,7 +287,7 @@ class UbiquitiSSHClient:
                 aps.append(current_ap)
             
             # Ordenar por señal (más fuerte primero)
-            aps.sort(key=lambda x: x.get("signal_dbm", -100), reverse=True)
+            aps.sort(key=_signal_sort_key, reverse=True)
             
             return {
                 "success": True,
@@ -607,6 +618,30 @@ class UbiquitiSSHClient:
                 await conn.wait_closed()
                 logger.info("Conexión cerrada")
 
+    @staticmethod
+    def _collect_ping3_samples(ip: str, count: int) -> List[Optional[float]]:
+        """
+        Hace `count` pings secuenciales con ping3 (bloqueante, correr fuera del event loop)
+
+        Args:
+            ip: Dirección IP del dispositivo
+            count: Cantidad de pings
+
+        Returns:
+            Lista con la latencia en ms de cada ping, o None si hubo timeout/error
+        """
+        pings = []
+        for _ in range(count):
+            try:
+                result = ping(ip, timeout=1)  # 1 segundo timeout por ping
+                if result is not None:
+                    pings.append(result * 1000)  # Convertir a ms
+                else:
+                    pings.append(None)  # Timeout
+            except:
+                pings.append(None)
+        return pings
+
     async def ping_device_seconds(self, ip: str, time: int = 10):
         """
         Hace ping a un dispositivo por un tiempo determinado usando ping3
@@ -623,17 +658,8 @@ class UbiquitiSSHClient:
             
             logger.info(f"Haciendo ping estructurado a {ip} por {time} segundos...")
             
-            # Hacer múltiples pings y calcular estadísticas
-            pings = []
-            for i in range(time):
-                try:
-                    result = ping(ip, timeout=1)  # 1 segundo timeout por ping
-                    if result is not None:
-                        pings.append(result * 1000)  # Convertir a ms
-                    else:
-                        pings.append(None)  # Timeout
-                except:
-                    pings.append(None)
+            # Hacer múltiples pings (bloqueantes) en un thread para no frenar el event loop
+            pings = await asyncio.to_thread(self._collect_ping3_samples, ip, time)
             
             # Calcular estadísticas
             successful_pings = [p for p in pings if p is not None]
@@ -690,30 +716,39 @@ class UbiquitiSSHClient:
             Dict con resultado del ping
         """
         try:
-            import subprocess
-            
             # Determinar el comando según el SO
-            import platform
             if platform.system().lower() == "windows":
                 cmd = ["ping", "-n", str(time), ip]
             else:
                 cmd = ["ping", "-c", str(time), ip]
             
-            # Ejecutar ping
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=time + 5
+            # Ejecutar ping como subproceso asíncrono: no bloquea el event loop
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
             )
+            try:
+                stdout_bytes, stderr_bytes = await asyncio.wait_for(proc.communicate(), timeout=time + 5)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return {
+                    "status": "timeout",
+                    "ip": ip,
+                    "time_seconds": time,
+                    "error": f"Ping timeout después de {time} segundos"
+                }
+            stdout = stdout_bytes.decode(errors="replace")
+            stderr = stderr_bytes.decode(errors="replace")
             
             # Parsear el output para extraer estadísticas
             avg_ms = 0
             packet_loss = 0
             try:
-                logger.debug(f"Output completo del ping: {result.stdout}")
+                logger.debug(f"Output completo del ping: {stdout}")
                 # Buscar la línea con las estadísticas
-                lines = result.stdout.split('\n')
+                lines = stdout.split('\n')
                 for line in lines:
                     logger.debug(f"Analizando línea: {line}")
                     
@@ -723,8 +758,7 @@ class UbiquitiSSHClient:
                         # o del formato: "10 packets transmitted, 9 packets received, 10.0% packet loss"
                         try:
                             # Buscar el número antes de '%'
-                            import re
-                            match = re.search(r'(\d+\.?\d*)%', line)
+                            match = _PACKET_LOSS_RE.search(line)
                             if match:
                                 packet_loss = float(match.group(1))
                                 logger.debug(f"Packet loss extraído: {packet_loss}%")
@@ -744,22 +778,15 @@ class UbiquitiSSHClient:
                 pass  # Si falla el parseo, usar valores por defecto
             
             return {
-                "status": "success" if result.returncode == 0 else "failed",
+                "status": "success" if proc.returncode == 0 else "failed",
                 "ip": ip,
                 "time_seconds": time,
                 "avg_ms": avg_ms,
                 "packet_loss": packet_loss,
-                "output": result.stdout,
-                "error": result.stderr if result.returncode != 0 else None
+                "output": stdout,
+                "error": stderr if proc.returncode != 0 else None
             }
             
-        except subprocess.TimeoutExpired:
-            return {
-                "status": "timeout",
-                "ip": ip,
-                "time_seconds": time,
-                "error": f"Ping timeout después de {time} segundos"
-            }
         except Exception as e:
             return {
                 "status": "error",
@@ -788,20 +815,11 @@ class UbiquitiSSHClient:
             attempts += 1
             
             try:
-                # Ping simple para verificar conexión
-                if platform.system().lower() == "windows":
-                    cmd = ["ping", "-n", "1", "-w", "1000", ip]
-                else:
-                    cmd = ["ping", "-c", "1", "-W", "1", ip]
-                
-                result = subprocess.run(
-                    cmd, 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=3
-                )
-                
-                if result.returncode == 0:
+                # Ping simple con ping3 en proceso (en un thread): sin lanzar el binario ping por intento
+                response = await asyncio.to_thread(ping, ip, timeout=1)
+
+                # ping3 devuelve la latencia (float) si respondió; None/False si no
+                if isinstance(response, float):
                     # Dispositivo respondió
                     elapsed_time = time.time() - start_time
                     return {
@@ -812,8 +830,6 @@ class UbiquitiSSHClient:
                         "message": f"Dispositivo conectado después de {attempts} intentos en {elapsed_time:.2f} segundos"
                     }
                 
-            except subprocess.TimeoutExpired:
-                pass
             except Exception as e:
                 return {
                     "status": "error",
@@ -2,10 +2,15 @@
 
 import httpx
 from typing import Dict, Any, Optional
+from app_fast_api.utils.json_utils import decode_json_response
 from app_fast_api.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Endpoints de la API de UISP (relativos a base_url)
+_DEVICES_PATH = '/v2.1/devices'
+_DEVICE_SSIDS_PATH = '/v2.1/devices/ssids'
+
 class UISPService:
     """UISP Service"""
     def __init__(self, base_url: str, token: str) -> None:
@@ -20,15 +25,20 @@ class UISPService:
                 'Accept': 'application/json'
             },
             timeout=httpx.Timeout(60.0, connect=10.0),  # 60s total, 10s para conectar
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
             verify=False
         )
 
+    async def close(self) -> None:
+        """Close the underlying HTTP client"""
+        await self.session.aclose()
+
     async def get_all_uisp_devices(self) -> Optional[Dict[str, Any]]:
         """Get all devices from UISP"""
         try:
-            response = await self.session.get('/v2.1/devices')
+            response = await self.session.get(_DEVICES_PATH)
             response.raise_for_status()
-            return response.json()
+            return decode_json_response(response)
         except httpx.RequestError as e:
             logger.error(f'[get_all_uisp_devices]:Error getting devices from UISP: {e}')
             raise Exception(f"[get_all_uisp_devices]:Error al obtener dispositivos de UISP: {e}")
@@ -40,9 +50,9 @@ class UISPService:
     async def get_device_ssids(self) -> Optional[Dict[str, Any]]:
         """"""
         try:
-            response = await self.session.get('/v2.1/devices/ssids')
+            response = await self.session.get(_DEVICE_SSIDS_PATH)
             response.raise_for_status()
-            return response.json()
+            return decode_json_response(response)
         except httpx.RequestError as e:
             logger.error(f'[get_device_ssids]:Error getting devices from UISP: {e}')
             raise Exception(f"[get_device_ssids]:Error al obtener dispositivos de UISP: {e}")
@@ -63,9 +73,12 @@ class UISPService:
             Dictionary with timeseries data
         """
         try:
-            response = await self.session.get(f'/v2.1/devices/{device_id}/statistics?interval={interval}')
+            response = await self.session.get(
+                f'{_DEVICES_PATH}/{device_id}/statistics',
+                params={'interval': interval}
+            )
             response.raise_for_status()
-            return response.json()
+            return decode_json_response(response)
         except httpx.RequestError as e:
             logger.error(f'[get_device_statistics]: Error getting statistics for device {device_id}: {e}')
             return None
@@ -2,15 +2,121 @@
 WhatsApp Service for sending alerts
 """
 
+import asyncio
 import httpx
 import os
-from typing import Dict, Any, Optional
+import re
+from typing import Any, Callable, Dict, Optional
 from datetime import datetime
+from app_fast_api.utils.json_utils import decode_json_response
 from app_fast_api.utils.logger import get_logger
 from app_fast_api.utils.timezone import format_argentina_datetime, format_argentina_time, now_argentina
 
 logger = get_logger(__name__)
 
+# Etiquetas que se leen de la nota del site (texto libre cargado en UISP)
+_NOTE_LABELS = (
+    "Tipo de acceso:",
+    "Tiene baterías:",
+    "Duración estimada:",
+    "Nombre:",
+    "Teléfono:",
+    "Nodo vecino para recuperación:",
+    "AP que se puede utilizar:",
+    "Se manda guardia solo si:",
+    "Horarios permitidos:",
+)
+_NOTE_LABEL_RE = re.compile("|".join(map(re.escape, _NOTE_LABELS)))
+
+
+def _parse_site_note(text: Optional[str]) -> Dict[str, str]:
+    """
+    Extract every known label from a site note in a single scan.
+
+    Args:
+        text: Site note text
+
+    Returns:
+        Dict label -> value (rest of the line, stripped) for the first occurrence of each label
+    """
+    info = {}
+    if not text:
+        return info
+
+    for match in _NOTE_LABEL_RE.finditer(text):
+        label = match.group()
+        if label in info:
+            continue
+        end = text.find("\n", match.end())
+        if end == -1:
+            end = len(text)
+        info[label] = text[match.end():end].strip()
+    return info
+
+
+# Plantilla del mensaje completo de caída (se completa con format_map)
+_COMPLETE_MESSAGE_TEMPLATE = """🚨 ALERTA CRÍTICA - SITE CAÍDO
+
+📍 Site: {site_name}
+⚠️ Estado: {outage_pct:.0f}% de dispositivos caídos ({device_outage}/{device_count})
+🕐 Detectado: {detected_at}
+
+📋 INFORMACIÓN DE CONTACTO
+👤 Contacto: {contact_name}
+📱 Teléfono: {contact_phone}
+📧 Email: {contact_email}
+
+🚪 ACCESO AL NODO
+{access_type}
+
+🔋 ENERGÍA
+{has_batteries}
+Duración: {battery_duration}
+
+🏢 COOPERATIVA
+Nombre: {coop_name}
+☎️  Teléfono: {coop_phone}
+
+🔗 CONECTIVIDAD DE RESPALDO
+Nodo vecino: {neighbor_node}
+AP disponible: {backup_ap}
+
+👮 CRITERIOS GUARDIA
+{guard_criteria}
+Horarios: {guard_hours}
+"""
+
+# Plantillas de los mensajes resumido y de recuperación (se completan con format_map)
+_SUMMARY_MESSAGE_TEMPLATE = """🚨 ALERTA: {site_name} CAÍDO
+⚠️ {device_outage}/{device_count} dispositivos down ({outage_pct:.0f}%)
+🕐 {detected_time}"""
+
+_RECOVERY_MESSAGE_TEMPLATE = """✅ RECUPERACIÓN: {site_name}
+⏱️ Caída: {downtime_str}
+📊 Devices: {device_count}/{device_count} activos
+🕐 Recuperado: {recovery_time}"""
+
+
+def _format_event_time(value: Any, formatter: Callable[[datetime], str]) -> str:
+    """
+    Format an event timestamp (ISO string, datetime or missing) in Argentina timezone.
+
+    Args:
+        value: ISO 8601 string, datetime, or None (uses the current time)
+        formatter: format_argentina_datetime or format_argentina_time
+
+    Returns:
+        Formatted time; an unparseable string is returned as-is
+    """
+    if isinstance(value, str):
+        try:
+            return formatter(datetime.fromisoformat(value.replace('Z', '+00:00')))
+        except:
+            return value
+    if isinstance(value, datetime):
+        return formatter(value)
+    return formatter(now_argentina())
+
 
 class WhatsAppService:
     """Service for sending WhatsApp notifications"""
@@ -23,6 +129,16 @@ class WhatsAppService:
         self.timeout = 30.0
         self.enabled = os.getenv("WHATSAPP_ENABLED", "true").lower() == "true"
 
+        # Cliente HTTP persistente: reutiliza conexiones keep-alive entre envíos
+        self.session = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+        )
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client"""
+        await self.session.aclose()
+
     async def send_message(self, phone_number: str, message: str) -> Dict[str, Any]:
         """
         Send WhatsApp message to a phone number.
@@ -43,25 +159,24 @@ class WhatsAppService:
             return {"success": False, "error": "No phone number"}
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "phone_number": phone_number,
-                    "message": message
-                }
-
-                logger.info(f"Sending WhatsApp message to {phone_number}")
-                response = await client.post(self.api_url, json=payload)
-                response.raise_for_status()
-
-                result = response.json()
-                logger.info(f"✅ WhatsApp message sent successfully to {phone_number}")
-
-                return {
-                    "success": True,
-                    "phone_number": phone_number,
-                    "provider_response": result,
-                    "sent_at": now_argentina().isoformat()
-                }
+            payload = {
+                "phone_number": phone_number,
+                "message": message
+            }
+
+            logger.info(f"Sending WhatsApp message to {phone_number}")
+            response = await self.session.post(self.api_url, json=payload)
+            response.raise_for_status()
+
+            result = decode_json_response(response)
+            logger.info(f"✅ WhatsApp message sent successfully to {phone_number}")
+
+            return {
+                "success": True,
+                "phone_number": phone_number,
+                "provider_response": result,
+                "sent_at": now_argentina().isoformat()
+            }
 
         except httpx.TimeoutException:
             logger.error(f"❌ Timeout sending WhatsApp to {phone_number}")
@@ -105,63 +220,33 @@ class WhatsAppService:
         # Parse description for additional info
         description = site_data.get("description", {}).get("note", "")
 
-        # Extract key info from description (regex or simple parsing)
-        def extract_info(text: str, label: str, default: str = "No especificado") -> str:
-            try:
-                if label in text:
-                    start = text.find(label)
-                    end = text.find("\n", start)
-                    if end == -1:
-                        end = len(text)
-                    return text[start + len(label):end].strip()
-            except:
-                pass
-            return default
+        # Extract key info from description in a single pass
+        note_info = _parse_site_note(description)
+        not_specified = "No especificado"
 
         # Format detection time in Argentina timezone
-        detected_at_str = event_data.get('detected_at')
-        if isinstance(detected_at_str, str):
-            try:
-                detected_dt = datetime.fromisoformat(detected_at_str.replace('Z', '+00:00'))
-                detected_at_formatted = format_argentina_datetime(detected_dt)
-            except:
-                detected_at_formatted = detected_at_str
-        elif isinstance(detected_at_str, datetime):
-            detected_at_formatted = format_argentina_datetime(detected_at_str)
-        else:
-            detected_at_formatted = format_argentina_datetime(now_argentina())
+        detected_at_formatted = _format_event_time(event_data.get('detected_at'), format_argentina_datetime)
 
         # Build complete message
-        message = f"""🚨 ALERTA CRÍTICA - SITE CAÍDO
-
-📍 Site: {site_name}
-⚠️ Estado: {outage_pct:.0f}% de dispositivos caídos ({device_outage}/{device_count})
-🕐 Detectado: {detected_at_formatted}
-
-📋 INFORMACIÓN DE CONTACTO
-👤 Contacto: {contact_name}
-📱 Teléfono: {contact_phone}
-📧 Email: {contact_email}
-
-🚪 ACCESO AL NODO
-{extract_info(description, "Tipo de acceso:", "No especificado")}
-
-🔋 ENERGÍA
-{extract_info(description, "Tiene baterías:", "No especificado")}
-Duración: {extract_info(description, "Duración estimada:", "No especificado")}
-
-🏢 COOPERATIVA
-Nombre: {extract_info(description, "Nombre:", "No especificado")}
-☎️  Teléfono: {extract_info(description, "Teléfono:", "No especificado")}
-
-🔗 CONECTIVIDAD DE RESPALDO
-Nodo vecino: {extract_info(description, "Nodo vecino para recuperación:", "No especificado")}
-AP disponible: {extract_info(description, "AP que se puede utilizar:", "No especificado")}
-
-👮 CRITERIOS GUARDIA
-{extract_info(description, "Se manda guardia solo si:", "No especificado")}
-Horarios: {extract_info(description, "Horarios permitidos:", "No especificado")}
-"""
+        message = _COMPLETE_MESSAGE_TEMPLATE.format_map({
+            "site_name": site_name,
+            "outage_pct": outage_pct,
+            "device_outage": device_outage,
+            "device_count": device_count,
+            "detected_at": detected_at_formatted,
+            "contact_name": contact_name,
+            "contact_phone": contact_phone,
+            "contact_email": contact_email,
+            "access_type": note_info.get("Tipo de acceso:", not_specified),
+            "has_batteries": note_info.get("Tiene baterías:", not_specified),
+            "battery_duration": note_info.get("Duración estimada:", not_specified),
+            "coop_name": note_info.get("Nombre:", not_specified),
+            "coop_phone": note_info.get("Teléfono:", not_specified),
+            "neighbor_node": note_info.get("Nodo vecino para recuperación:", not_specified),
+            "backup_ap": note_info.get("AP que se puede utilizar:", not_specified),
+            "guard_criteria": note_info.get("Se manda guardia solo si:", not_specified),
+            "guard_hours": note_info.get("Horarios permitidos:", not_specified),
+        })
         return message.strip()
 
     def format_summary_message(self, site_data: Dict[str, Any], event_data: Dict[str, Any]) -> str:
@@ -181,21 +266,15 @@ Horarios: {extract_info(description, "Horarios permitidos:", "No especificado")}
         outage_pct = (device_outage / device_count * 100) if device_count > 0 else 0
 
         # Format detection time in Argentina timezone
-        detected_at_str = event_data.get('detected_at')
-        if isinstance(detected_at_str, str):
-            try:
-                detected_dt = datetime.fromisoformat(detected_at_str.replace('Z', '+00:00'))
-                detected_time = format_argentina_datetime(detected_dt)
-            except:
-                detected_time = detected_at_str
-        elif isinstance(detected_at_str, datetime):
-            detected_time = format_argentina_datetime(detected_at_str)
-        else:
-            detected_time = format_argentina_datetime(now_argentina())
+        detected_time = _format_event_time(event_data.get('detected_at'), format_argentina_datetime)
 
-        message = f"""🚨 ALERTA: {site_name} CAÍDO
-⚠️ {device_outage}/{device_count} dispositivos down ({outage_pct:.0f}%)
-🕐 {detected_time}"""
+        message = _SUMMARY_MESSAGE_TEMPLATE.format_map({
+            "site_name": site_name,
+            "device_outage": device_outage,
+            "device_count": device_count,
+            "outage_pct": outage_pct,
+            "detected_time": detected_time,
+        })
 
         return message.strip()
 
@@ -219,22 +298,14 @@ Horarios: {extract_info(description, "Horarios permitidos:", "No especificado")}
         downtime_str = f"{hours}h {minutes}min" if hours > 0 else f"{minutes}min"
 
         # Format recovery time in Argentina timezone
-        recovered_at_str = event_data.get('recovered_at')
-        if isinstance(recovered_at_str, str):
-            try:
-                recovered_dt = datetime.fromisoformat(recovered_at_str.replace('Z', '+00:00'))
-                recovery_time = format_argentina_time(recovered_dt)
-            except:
-                recovery_time = recovered_at_str
-        elif isinstance(recovered_at_str, datetime):
-            recovery_time = format_argentina_time(recovered_at_str)
-        else:
-            recovery_time = format_argentina_time(now_argentina())
+        recovery_time = _format_event_time(event_data.get('recovered_at'), format_argentina_time)
 
-        message = f"""✅ RECUPERACIÓN: {site_name}
-⏱️ Caída: {downtime_str}
-📊 Devices: {device_count}/{device_count} activos
-🕐 Recuperado: {recovery_time}"""
+        message = _RECOVERY_MESSAGE_TEMPLATE.format_map({
+            "site_name": site_name,
+            "downtime_str": downtime_str,
+            "device_count": device_count,
+            "recovery_time": recovery_time,
+        })
 
         return message.strip()
 
@@ -254,23 +325,33 @@ Horarios: {extract_info(description, "Horarios permitidos:", "No especificado")}
             "summary": None
         }
 
-        # Send complete message
+        sends = {}
+        reuse_complete = False
+
+        # Complete message
         if self.phone_complete:
             complete_msg = self.format_complete_message(site_data, event_data)
-            results["complete"] = await self.send_message(self.phone_complete, complete_msg)
+            sends["complete"] = self.send_message(self.phone_complete, complete_msg)
         else:
             logger.warning("No phone number configured for complete messages")
 
-        # Send summary message only if different from complete number
+        # Summary message only if different from complete number
         if self.phone_summary and self.phone_summary != self.phone_complete:
             summary_msg = self.format_summary_message(site_data, event_data)
-            results["summary"] = await self.send_message(self.phone_summary, summary_msg)
+            sends["summary"] = self.send_message(self.phone_summary, summary_msg)
         elif self.phone_summary == self.phone_complete:
             logger.info("Summary phone is same as complete phone, skipping duplicate message")
-            results["summary"] = results["complete"]  # Reuse complete result
+            reuse_complete = True
         else:
             logger.warning("No phone number configured for summary messages")
 
+        # Both numbers are independent, send concurrently
+        if sends:
+            results.update(zip(sends, await asyncio.gather(*sends.values())))
+
+        if reuse_complete:
+            results["summary"] = results["complete"]  # Reuse complete result
+
         return results
 
     async def send_recovery_alert(self, site_data: Dict[str, Any], event_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -291,15 +372,25 @@ Horarios: {extract_info(description, "Horarios permitidos:", "No especificado")}
             "summary": None
         }
 
-        # Send to complete number
+        sends = {}
+        reuse_complete = False
+
+        # Complete number
         if self.phone_complete:
-            results["complete"] = await self.send_message(self.phone_complete, recovery_msg)
+            sends["complete"] = self.send_message(self.phone_complete, recovery_msg)
 
-        # Send to summary number only if different from complete number
+        # Summary number only if different from complete number
         if self.phone_summary and self.phone_summary != self.phone_complete:
-            results["summary"] = await self.send_message(self.phone_summary, recovery_msg)
+            sends["summary"] = self.send_message(self.phone_summary, recovery_msg)
         elif self.phone_summary == self.phone_complete:
             logger.info("Summary phone is same as complete phone, skipping duplicate recovery message")
+            reuse_complete = True
+
+        # Both numbers are independent, send concurrently
+        if sends:
+            results.update(zip(sends, await asyncio.gather(*sends.values())))
+
+        if reuse_complete:
             results["summary"] = results["complete"]  # Reuse complete result
 
         return results
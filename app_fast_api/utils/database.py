@@ -1,6 +1,6 @@
 """Database configuration for Ubiquiti FastAPI application."""
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -16,8 +16,17 @@ if not DATABASE_URL:
     logger.error("❌ DATABASE_URL no está configurada en las variables de entorno")
     raise ValueError("DATABASE_URL es requerida. Configúrala en docker-compose.yml o variables de entorno")
 
+# Pool compartido por todo el proceso: pre_ping descarta conexiones que MySQL cerró por
+# inactividad (wait_timeout) y recycle las renueva antes de que eso ocurra
+_ENGINE_OPTIONS = {"pool_pre_ping": True, "pool_recycle": 3600}
+if not DATABASE_URL.startswith("sqlite"):
+    _ENGINE_OPTIONS.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    )
+
 # Create engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **_ENGINE_OPTIONS)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -34,8 +43,13 @@ def get_db():
     finally:
         db.close()
 
-def init_db():
-    """Initialize database tables."""
+def init_db(bind=None):
+    """
+    Initialize database tables.
+
+    Args:
+        bind: Optional open Connection to create the tables on (defaults to the engine)
+    """
     logger.info("Inicializando base de datos...")
     logger.info(f"Conectando a: {DATABASE_URL}")
 
@@ -46,7 +60,7 @@ def init_db():
         from app_fast_api.models.ubiquiti_monitoring.alerting import SiteMonitoring, AlertEvent
 
         # Create all tables
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=bind if bind is not None else engine)
         logger.info("✅ Tablas de base de datos creadas exitosamente")
         logger.info("Tablas disponibles:")
         logger.info("   - device_analysis")
@@ -0,0 +1,44 @@
+"""
+JSON helpers for upstream HTTP responses
+"""
+
+import json
+from typing import Any
+
+import httpx
+
+# Decoder compartido; UISP/UNMS y la API de WhatsApp responden JSON en UTF-8
+_decode_json = json.JSONDecoder().decode
+
+# Encoder compartido y compacto para las columnas JSON-como-texto de la base
+_encode_json = json.JSONEncoder(separators=(',', ':')).encode
+
+
+def decode_json_response(response: httpx.Response) -> Any:
+    """
+    Decode a JSON response straight from its UTF-8 body.
+
+    Skips the encoding sniffing and kwargs handling of Response.json().
+
+    Args:
+        response: httpx response with a JSON body
+
+    Returns:
+        Decoded JSON value
+    """
+    return _decode_json(response.content.decode('utf-8'))
+
+
+def encode_json(value: Any) -> str:
+    """
+    Serialize a value to compact JSON text for storage in a Text column.
+
+    Reuses one prebuilt encoder instead of building a JSONEncoder per json.dumps call.
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        Compact JSON string
+    """
+    return _encode_json(value)
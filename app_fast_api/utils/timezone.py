@@ -3,10 +3,20 @@ Timezone utilities for Argentina (UTC-3)
 """
 
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from typing import Optional
 
 # Argentina timezone (UTC-3)
 ARGENTINA_TZ = timezone(timedelta(hours=-3))
+_AR_OFFSET = timedelta(hours=-3)
+_ZERO_OFFSET = timedelta(0)
+# Sufijo ISO fijo de ARGENTINA_TZ (sin DST)
+_AR_SUFFIX = '-03:00'
+
+# Formatos usados en la aplicación
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+TIME_FORMAT = '%H:%M:%S'
+DATE_FORMAT = '%Y-%m-%d'
 
 
 def now_argentina() -> datetime:
@@ -19,12 +29,13 @@ def now_argentina() -> datetime:
     return datetime.now(ARGENTINA_TZ)
 
 
-def to_argentina_tz(dt: Optional[datetime]) -> Optional[datetime]:
+def to_argentina_tz(dt: Optional[datetime], naive_is_utc: bool = False) -> Optional[datetime]:
     """
     Convert datetime to Argentina timezone.
 
     Args:
         dt: Datetime to convert (can be naive or aware)
+        naive_is_utc: Treat naive datetimes as UTC instead of Argentina local time
 
     Returns:
         datetime: Datetime in Argentina timezone, or None if input is None
@@ -32,16 +43,60 @@ def to_argentina_tz(dt: Optional[datetime]) -> Optional[datetime]:
     if dt is None:
         return None
 
-    # If naive, assume it's already in Argentina timezone (server timezone)
     if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=ARGENTINA_TZ)
+        # Naive UTC (e.g. utcnow()-style values): shift by the fixed offset
+        if naive_is_utc:
+            return (dt + _AR_OFFSET).replace(tzinfo=ARGENTINA_TZ)
+
+        # Otherwise assume it's already in Argentina timezone (server timezone)
+        return dt.replace(tzinfo=ARGENTINA_TZ)
+
+    tz = dt.tzinfo
+
+    # Already in Argentina timezone, nothing to convert
+    if tz is ARGENTINA_TZ:
         return dt
 
+    # UTC input: fixed offset, plain arithmetic instead of astimezone
+    if tz is timezone.utc:
+        return (dt + _AR_OFFSET).replace(tzinfo=ARGENTINA_TZ)
+
+    offset = dt.utcoffset()
+
+    # Equivalent -03:00 tzinfo (fromisoformat, DB drivers): swap in the singleton
+    if offset == _AR_OFFSET:
+        return dt.replace(tzinfo=ARGENTINA_TZ)
+
+    if offset == _ZERO_OFFSET:
+        return (dt + _AR_OFFSET).replace(tzinfo=ARGENTINA_TZ)
+
     # If timezone-aware, convert to Argentina timezone
     return dt.astimezone(ARGENTINA_TZ)
 
 
-def format_argentina_datetime(dt: Optional[datetime], format_str: str = '%Y-%m-%d %H:%M:%S') -> str:
+def _fmt_datetime(dt: datetime) -> str:
+    """Format as YYYY-MM-DD HH:MM:SS without going through strftime."""
+    return f'{dt.year:04}-{dt.month:02}-{dt.day:02} {dt.hour:02}:{dt.minute:02}:{dt.second:02}'
+
+
+def _fmt_time(dt: datetime) -> str:
+    """Format as HH:MM:SS without going through strftime."""
+    return f'{dt.hour:02}:{dt.minute:02}:{dt.second:02}'
+
+
+def _fmt_date(dt: datetime) -> str:
+    """Format as YYYY-MM-DD without going through strftime."""
+    return f'{dt.year:04}-{dt.month:02}-{dt.day:02}'
+
+
+_FAST_FORMATTERS = {
+    DATETIME_FORMAT: _fmt_datetime,
+    TIME_FORMAT: _fmt_time,
+    DATE_FORMAT: _fmt_date,
+}
+
+
+def format_argentina_datetime(dt: Optional[datetime], format_str: str = DATETIME_FORMAT) -> str:
     """
     Format datetime in Argentina timezone.
 
@@ -56,6 +111,12 @@ def format_argentina_datetime(dt: Optional[datetime], format_str: str = '%Y-%m-%
         return "N/A"
 
     argentina_dt = to_argentina_tz(dt)
+
+    # Known formats are assembled directly from the datetime fields
+    fast_formatter = _FAST_FORMATTERS.get(format_str)
+    if fast_formatter is not None:
+        return fast_formatter(argentina_dt)
+
     return argentina_dt.strftime(format_str)
 
 
@@ -69,7 +130,10 @@ def format_argentina_time(dt: Optional[datetime]) -> str:
     Returns:
         str: Formatted time string (HH:MM:SS)
     """
-    return format_argentina_datetime(dt, '%H:%M:%S')
+    if dt is None:
+        return "N/A"
+
+    return _fmt_time(to_argentina_tz(dt))
 
 
 def format_argentina_date(dt: Optional[datetime]) -> str:
@@ -82,26 +146,43 @@ def format_argentina_date(dt: Optional[datetime]) -> str:
     Returns:
         str: Formatted date string (YYYY-MM-DD)
     """
-    return format_argentina_datetime(dt, '%Y-%m-%d')
+    if dt is None:
+        return "N/A"
 
+    return _fmt_date(to_argentina_tz(dt))
 
-def to_argentina_isoformat(dt: Optional[datetime]) -> Optional[str]:
+
+def to_argentina_isoformat(dt: Optional[datetime], naive_is_utc: bool = False) -> Optional[str]:
     """
     Convert datetime to Argentina timezone and return ISO format string.
 
     Args:
         dt: Datetime to convert (can be naive or aware)
+        naive_is_utc: Treat naive datetimes as UTC instead of Argentina local time
 
     Returns:
         str: ISO format string with Argentina timezone, or None if input is None
 
     Example:
-        >>> dt = datetime(2026, 2, 9, 8, 13, 5)  # UTC naive
+        >>> dt = datetime(2026, 2, 9, 8, 13, 5)  # naive, Argentina local
         >>> to_argentina_isoformat(dt)
+        '2026-02-09T08:13:05-03:00'
+        >>> to_argentina_isoformat(dt, naive_is_utc=True)
         '2026-02-09T05:13:05-03:00'
     """
     if dt is None:
         return None
 
-    argentina_dt = to_argentina_tz(dt)
-    return argentina_dt.isoformat()
+    return _isoformat_cached(dt, naive_is_utc)
+
+
+@lru_cache(maxsize=4096)
+def _isoformat_cached(dt: datetime, naive_is_utc: bool) -> str:
+    """ISO string in Argentina time, memoized for rows serialized repeatedly."""
+    ar = to_argentina_tz(dt, naive_is_utc)
+
+    # Same layout as isoformat(), with the fixed offset appended directly
+    base = f'{ar.year:04}-{ar.month:02}-{ar.day:02}T{ar.hour:02}:{ar.minute:02}:{ar.second:02}'
+    if ar.microsecond:
+        return f'{base}.{ar.microsecond:06}{_AR_SUFFIX}'
+    return base + _AR_SUFFIX
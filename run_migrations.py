@@ -15,11 +15,35 @@ import os
 import sys
 from alembic.config import Config
 from alembic import command
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 from pathlib import Path
+from sqlalchemy import create_engine
 
 # Get project root directory
 PROJECT_ROOT = Path(__file__).parent
 
+# Engine compartido entre run_migrations y check_migrations_status
+_engine = None
+
+
+def _make_cfg(database_url):
+    """Build the Alembic config pointing at database_url."""
+    alembic_cfg = Config(str(PROJECT_ROOT / "alembic.ini"))
+    alembic_cfg.set_main_option("sqlalchemy.url", database_url)
+    return alembic_cfg
+
+
+def _get_engine(database_url):
+    """Return the shared migrations engine (a single pooled connection)."""
+    global _engine
+
+    if _engine is None:
+        _engine = create_engine(database_url, pool_pre_ping=True, pool_size=1, max_overflow=0)
+
+    return _engine
+
+
 def run_migrations():
     """Run all pending Alembic migrations."""
     try:
@@ -39,12 +63,22 @@ def run_migrations():
             print(f"❌ ERROR: alembic.ini not found at {alembic_ini}")
             return False
 
-        alembic_cfg = Config(str(alembic_ini))
-        alembic_cfg.set_main_option("sqlalchemy.url", database_url)
+        alembic_cfg = _make_cfg(database_url)
+
+        # Fast path: nothing pending, skip the upgrade (and its version-table lock)
+        head = ScriptDirectory.from_config(alembic_cfg).get_current_head()
+        with _get_engine(database_url).connect() as conn:
+            current = MigrationContext.configure(conn).get_current_revision()
 
-        # Run migrations to head (latest version)
+        if current is not None and current == head:
+            print(f"✅ Already at head ({head}), nothing to migrate")
+            return True
+
+        # Run migrations to head (latest version) on the shared connection
         print("📝 Applying migrations...")
-        command.upgrade(alembic_cfg, "head")
+        with _get_engine(database_url).begin() as conn:
+            alembic_cfg.attributes['connection'] = conn
+            command.upgrade(alembic_cfg, "head")
 
         print("✅ Migrations completed successfully!")
         return True
@@ -64,12 +98,12 @@ def check_migrations_status():
             print("❌ DATABASE_URL not set")
             return
 
-        alembic_ini = PROJECT_ROOT / "alembic.ini"
-        alembic_cfg = Config(str(alembic_ini))
-        alembic_cfg.set_main_option("sqlalchemy.url", database_url)
+        alembic_cfg = _make_cfg(database_url)
 
         print("📋 Current migration status:")
-        command.current(alembic_cfg)
+        with _get_engine(database_url).connect() as conn:
+            alembic_cfg.attributes['connection'] = conn
+            command.current(alembic_cfg)
 
         print("\n📋 Migration history:")
         command.history(alembic_cfg)